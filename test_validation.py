@@ -0,0 +1,136 @@
+"""
+Tests for the CSV reading and report helpers in validation.py
+
+    python -m pytest test_validation.py
+"""
+
+import sys
+import types
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+# validation.py imports greeks_calculator, which lives outside this repository.
+# None of the helpers tested here use it.
+try:
+    import greeks_calculator  # noqa: F401
+except ImportError:
+    sys.modules["greeks_calculator"] = types.ModuleType("greeks_calculator")
+
+import validation
+
+HEADER = "Strike_Price,Expiry_Date,CE_LTP,PE_LTP,CE_IV,PE_IV,Note\n"
+
+
+def _rows(num_rows, start=0):
+    return [
+        f"{24000 + (start + i) * 50},07-Nov-2025,{120.5 + i},{80.25 + i},12.3,13.1,x\n"
+        for i in range(num_rows)
+    ]
+
+
+def _blank_line_across_chunk_boundary():
+    """
+    Rows filling exactly one read chunk, then blank lines starting the next chunk
+
+    More rows follow than precede the blank lines, so they sit before the middle row.
+    """
+    chunk_size = validation.READ_CHUNK_SIZE
+    text = HEADER
+    i = 0
+    while chunk_size - len(text) >= 200:
+        text += _rows(1, start=i)[0]
+        i += 1
+
+    # Pad the Note column of one last row so the rows end exactly at the chunk boundary
+    last = _rows(1, start=i)[0]
+    text += last[:-1] + "x" * (chunk_size - len(text) - len(last)) + "\n"
+    assert len(text) == chunk_size
+
+    return text + "\n\n" + "".join(_rows(2 * i, start=i + 1))
+
+
+CASES = {
+    'no_blank_lines': HEADER + "".join(_rows(101)),
+    'no_trailing_newline': HEADER + "".join(_rows(101))[:-1],
+    'trailing_blank_line': HEADER + "".join(_rows(101)) + "\n",
+    'interior_blank_lines': HEADER + "".join(_rows(10)) + "\n\n\n\n" + "".join(_rows(91, start=10)),
+    'whitespace_only_lines': HEADER + "".join(_rows(10)) + "   \n\t\r\n" + "".join(_rows(91, start=10)),
+    'crlf_blank_line': (HEADER + "".join(_rows(101))).replace("\n", "\r\n") + "\r\n",
+    'blank_line_across_chunk_boundary': _blank_line_across_chunk_boundary(),
+    'quoted_multiline_fields': HEADER + "".join(
+        row[:-2] + '"line 1\nline 2"\n' for row in _rows(10)) + "".join(_rows(91, start=10)),
+    'quoted_field': HEADER + "".join(_rows(10)) + "".join(
+        row[:-2] + '"x"\n' for row in _rows(91, start=10)),
+}
+
+# Cases where every line after the header is one data row, so the middle row is streamed
+STREAMED = {'no_blank_lines', 'no_trailing_newline'}
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_read_atm_row_matches_full_read(tmp_path, monkeypatch, name):
+    monkeypatch.setattr(validation, 'MIN_ROWS_TO_STREAM', 50)
+    csv_path = tmp_path / f"{name}.csv"
+    csv_path.write_bytes(CASES[name].encode())
+
+    df, atm_idx = validation._read_atm_row(str(csv_path))
+    full = pd.read_csv(csv_path)
+
+    assert (len(df) == 1) == (name in STREAMED)
+
+    columns = list(validation.REPORT_COLUMNS)
+    expected = full.iloc[len(full) // 2][columns].tolist()
+    assert df.iloc[atm_idx][columns].tolist() == expected
+
+
+@pytest.mark.parametrize('expiry_str, expected', [
+    ('07-Nov-2025', date(2025, 11, 7)),
+    ('7-Nov-2025', date(2025, 11, 7)),
+    ('07-nov-2025', date(2025, 11, 7)),
+    ('07-NOV-2025', date(2025, 11, 7)),
+    ('2025-11-07', date(2025, 11, 7)),
+    ('2025-1-7', date(2025, 1, 7)),
+])
+def test_parse_expiry(expiry_str, expected):
+    assert validation._parse_expiry(expiry_str) == expected
+
+
+@pytest.mark.parametrize('expiry_str', [
+    '25-Dec-26',
+    '26-12-25',
+    '07-Nov-025',
+    '20251107',
+    '2025-W45-5',
+    '07-Foo-2025',
+    '2025-13-01',
+    '2025-11-007',
+    '',
+    float('nan'),
+    None,
+])
+def test_parse_expiry_rejects(expiry_str):
+    with pytest.raises(ValueError):
+        validation._parse_expiry(expiry_str)
+
+
+def test_percent_diff_from_first():
+    # Columns: positive base, zero base, NaN base, negative base (e.g. theta)
+    greeks = np.array([
+        [0.50, 0.0, np.nan, -2.0],
+        [0.45, 0.1, 1.0, -1.5],
+        [0.55, 0.0, 1.0, -2.5],
+    ])
+
+    diff = validation._percent_diff_from_first(greeks)
+
+    np.testing.assert_allclose(diff[:, 0], [0.0, -10.0, 10.0])
+    # Zero base gives 0 rather than a division error
+    np.testing.assert_array_equal(diff[:, 1], [0.0, 0.0, 0.0])
+    # NaN base stays visible instead of reading as "no difference"
+    assert np.isnan(diff[:, 2]).all()
+    # Negative base: a smaller magnitude is an increase, a larger one a decrease
+    np.testing.assert_allclose(diff[:, 3], [0.0, 25.0, -25.0])
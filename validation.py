@@ -9,16 +9,54 @@ Usage:
     python greeks_validation_report.py --csv 2025-11-07/nifty_weekly_*.csv
 """
 
+import numpy as np
 import pandas as pd
-import argparse
+import io
+import re
 import sys
-from datetime import datetime
-from pathlib import Path
+from datetime import date, datetime
 import greeks_calculator as gc
 
+# Only these columns of the options chain are used by the report
+REPORT_COLUMNS = ('Strike_Price', 'Expiry_Date', 'CE_LTP', 'PE_LTP', 'CE_IV', 'PE_IV')
+
+# Below this many rows parsing the whole chain is as fast as seeking to the middle row
+MIN_ROWS_TO_STREAM = 1000
+
+# Size of the binary reads used to scan a CSV before streaming it
+READ_CHUNK_SIZE = 1 << 20
+
+# An empty or whitespace-only line, which pandas skips when reading
+_BLANK_LINE = re.compile(rb'\n[ \t\r\f\v]*\n')
+
+# Greeks shown in the report, in column order
+GREEK_NAMES = ('delta', 'gamma', 'vega', 'theta')
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+
+def _parse_expiry(expiry_str):
+    """Parse an expiry date in '%Y-%m-%d' or '%d-%b-%Y' format, raising ValueError otherwise"""
+    parts = str(expiry_str).split('-')
+    if len(parts) == 3:
+        first, month, last = parts
+        if month.isdigit() and len(month) <= 2:
+            year, month_num, day = first, int(month), last
+        else:
+            year, month_num, day = last, _MONTHS.get(month.title()), first
+
+        # Same widths as strptime: 4-digit year, 1-2 digit day
+        if month_num and len(year) == 4 and year.isdigit() and len(day) <= 2 and day.isdigit():
+            return date(int(year), month_num, int(day))
+
+    raise ValueError(f"Unrecognised expiry date: {expiry_str!r}")
+
 
 def calculate_greeks_with_rate(spot, strike, time_to_expiry, market_iv, option_type, risk_free_rate):
-    """Calculate Greeks with specified risk-free rate"""
+    """Calculate Greeks with specified risk-free rate, as a tuple ordered like GREEK_NAMES"""
     greeks = gc.calculate_all_greeks(
         spot=spot,
         strike=strike,
@@ -28,60 +66,181 @@ def calculate_greeks_with_rate(spot, strike, time_to_expiry, market_iv, option_t
         risk_free_rate=risk_free_rate
     )
 
-    # Also calculate IV with this rate
-    # Note: We're using the market LTP, which should give us back similar IV
-    # The IV might differ slightly due to the risk-free rate assumption
+    return tuple(greeks[name] for name in GREEK_NAMES)
+
+
+def _scan_csv_lines(csv_path):
+    """
+    Count the data rows of a CSV file (lines after the header)
+
+    Returns:
+    --------
+    tuple
+        (number of data rows, or None if data rows and physical lines may not
+        line up because of blank lines or quoted fields)
+    """
+    num_lines = 0
+    # Starts at a line boundary so a blank first line is caught too
+    tail = b'\n'
+    with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            # Quoted fields can span lines; pandas skips blank lines
+            if b'"' in chunk:
+                return None
+            data = tail + chunk
+            if _BLANK_LINE.search(data):
+                return None
+
+            num_lines += chunk.count(b'\n')
+            # Keep the unterminated last line for the next chunk
+            tail = data[data.rfind(b'\n'):]
+
+    # Last line without a trailing newline
+    last_line = tail[1:]
+    if last_line:
+        if not last_line.strip():
+            return None
+        num_lines += 1
+
+    return max(num_lines - 1, 0)
+
+
+def _read_atm_row(csv_path):
+    """
+    Read the report columns of an options chain CSV, parsing only the middle row when possible
+
+    Returns:
+    --------
+    tuple
+        (DataFrame, index of the middle (ATM) row within it)
+    """
+    read_kwargs = {
+        'usecols': lambda col: col in REPORT_COLUMNS,
+        'dtype': {'Expiry_Date': str}
+    }
+
+    num_rows = _scan_csv_lines(csv_path)
+    if num_rows is not None and num_rows >= MIN_ROWS_TO_STREAM:
+        # Skip straight to the middle data row, keeping the header line. A
+        # callable keeps pandas from building a set of every skipped line.
+        mid = num_rows // 2
+        df = pd.read_csv(csv_path, skiprows=lambda i: 0 < i <= mid, nrows=1, **read_kwargs)
+        return df, 0
+
+    # Small file, or lines that do not map one-to-one onto data rows
+    df = pd.read_csv(csv_path, **read_kwargs)
+    return df, len(df) // 2
+
+
+def _format_percent_rows(row_names, percents):
+    """Format a matrix of percentages as report table rows, one per row name"""
+    buf = io.StringIO()
+    np.savetxt(
+        buf,
+        np.column_stack([np.array(list(row_names), dtype=object), percents]),
+        fmt=['%-20s'] + ['%9.2f%%'] * percents.shape[1],
+        delimiter=' '
+    )
+    return buf.getvalue().rstrip('\n')
+
 
-    return greeks
+def _percent_diff_from_first(greeks_matrix):
+    """
+    Percentage difference of each row of a (rates x Greeks) matrix from its first row
+
+    Differences are taken relative to the magnitude of the first row, so the
+    sign always shows the direction of change. Greeks that are zero in the
+    first row get a difference of 0; NaN Greeks stay NaN.
+    """
+    base = greeks_matrix[0]
+    diff = np.divide(greeks_matrix - base, np.abs(base),
+                     out=np.zeros_like(greeks_matrix), where=base != 0)
+    return diff * 100
 
 
 def generate_validation_report(csv_path, output_path=None):
     """
     Generate comprehensive validation report comparing different risk-free rates
 
+    The report is buffered and written to stdout in one call.
+
     Parameters:
     -----------
     csv_path : str
         Path to the options chain CSV file
     output_path : str, optional
-        Path to save the report (default: same directory as CSV)
+        Path to also save the report to
+    """
+
+    lines = []
+    try:
+        completed = _build_report(csv_path, lines.append)
+    finally:
+        report = "\n".join(lines) + "\n"
+        sys.stdout.write(report)
+
+    if completed and output_path:
+        try:
+            with open(output_path, 'wb') as f:
+                f.write(report.encode('utf-8'))
+        except OSError as e:
+            print(f"Error saving report: {e}")
+        else:
+            print(f"Report saved to: {output_path}")
+
+
+def _build_report(csv_path, out):
     """
+    Build the validation report line by line
 
-    print("=" * 80)
-    print("GREEKS VALIDATION & COMPARISON REPORT")
-    print("=" * 80)
-    print()
+    Parameters:
+    -----------
+    csv_path : str
+        Path to the options chain CSV file
+    out : callable
+        Called with each line of the report
+
+    Returns:
+    --------
+    bool
+        False if the CSV could not be used, True otherwise
+    """
+
+    out("=" * 80)
+    out("GREEKS VALIDATION & COMPARISON REPORT")
+    out("=" * 80)
+    out("")
 
     # Load CSV
-    print(f"Loading data from: {csv_path}")
+    out(f"Loading data from: {csv_path}")
     try:
-        df = pd.read_csv(csv_path)
+        df, atm_idx = _read_atm_row(csv_path)
     except Exception as e:
-        print(f"Error loading CSV: {e}")
-        return
+        out(f"Error loading CSV: {e}")
+        return False
 
     # Extract metadata from CSV
-    # Assuming first row contains the data
     if len(df) == 0:
-        print("Error: CSV file is empty")
-        return
+        out("Error: CSV file is empty")
+        return False
 
-    # Find ATM strike (middle of the chain)
-    atm_idx = len(df) // 2
-    atm_row = df.iloc[atm_idx]
+    missing = [col for col in REPORT_COLUMNS if col not in df.columns]
+    if missing:
+        out(f"Error: CSV is missing required columns: {', '.join(missing)}")
+        return False
 
-    strike = atm_row['Strike_Price']
-    expiry_str = atm_row['Expiry_Date']
+    # ATM strike is the middle row of the chain
+    cols = {col: df.columns.get_loc(col) for col in REPORT_COLUMNS}
+
+    strike = df.iat[atm_idx, cols['Strike_Price']]
+    expiry_str = df.iat[atm_idx, cols['Expiry_Date']]
 
     # Parse expiry date
     try:
-        expiry_date = datetime.strptime(expiry_str, '%d-%b-%Y').date()
-    except:
-        try:
-            expiry_date = datetime.strptime(expiry_str, '%Y-%m-%d').date()
-        except:
-            print(f"Error: Could not parse expiry date: {expiry_str}")
-            return
+        expiry_date = _parse_expiry(expiry_str)
+    except ValueError:
+        out(f"Error: Could not parse expiry date: {expiry_str}")
+        return False
 
     # Get spot price (from CE data - it's the underlying)
     # Spot is not directly in CSV, but we can infer from the data
@@ -97,24 +256,24 @@ def generate_validation_report(csv_path, output_path=None):
     time_to_expiry = gc.get_time_to_expiry(expiry_date, current_time)
 
     # Get market data for ATM strike
-    ce_ltp = atm_row.get('CE_LTP', 0)
-    pe_ltp = atm_row.get('PE_LTP', 0)
-    ce_iv = atm_row.get('CE_IV', 0) / 100  # Convert to decimal
-    pe_iv = atm_row.get('PE_IV', 0) / 100
-
-    print(f"\nOption Details:")
-    print(f"  Strike: {strike}")
-    print(f"  Expiry: {expiry_str} ({expiry_date})")
-    print(f"  Time to Expiry: {time_to_expiry:.6f} years ({time_to_expiry * 365:.1f} days)")
-    print(f"  Approx Spot: {spot}")
-    print()
-
-    print(f"Market Data (from CSV):")
-    print(f"  CE LTP: {ce_ltp}")
-    print(f"  CE IV: {ce_iv * 100:.2f}%")
-    print(f"  PE LTP: {pe_ltp}")
-    print(f"  PE IV: {pe_iv * 100:.2f}%")
-    print()
+    ce_ltp = df.iat[atm_idx, cols['CE_LTP']]
+    pe_ltp = df.iat[atm_idx, cols['PE_LTP']]
+    ce_iv = df.iat[atm_idx, cols['CE_IV']] / 100  # Convert to decimal
+    pe_iv = df.iat[atm_idx, cols['PE_IV']] / 100
+
+    out(f"\nOption Details:")
+    out(f"  Strike: {strike}")
+    out(f"  Expiry: {expiry_str} ({expiry_date})")
+    out(f"  Time to Expiry: {time_to_expiry:.6f} years ({time_to_expiry * 365:.1f} days)")
+    out(f"  Approx Spot: {spot}")
+    out("")
+
+    out(f"Market Data (from CSV):")
+    out(f"  CE LTP: {ce_ltp}")
+    out(f"  CE IV: {ce_iv * 100:.2f}%")
+    out(f"  PE LTP: {pe_ltp}")
+    out(f"  PE IV: {pe_iv * 100:.2f}%")
+    out("")
 
     # Define different risk-free rates to compare
     rates_to_compare = {
@@ -124,133 +283,107 @@ def generate_validation_report(csv_path, output_path=None):
         'Conservative (5%)': 0.05
     }
 
-    print("=" * 80)
-    print("CALL OPTION (CE) GREEKS COMPARISON")
-    print("=" * 80)
-    print()
-
-    # Header
-    print(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
-    print("-" * 80)
-
-    ce_results = {}
-    for rate_name, rate_value in rates_to_compare.items():
-        greeks = calculate_greeks_with_rate(
+    # One row of Greeks per (option type, rate): all CE rates, then all PE rates
+    greeks_matrix = np.array([
+        calculate_greeks_with_rate(
             spot=spot,
             strike=strike,
             time_to_expiry=time_to_expiry,
-            market_iv=ce_iv,
-            option_type='CE',
+            market_iv=market_iv,
+            option_type=option_type,
             risk_free_rate=rate_value
         )
-        ce_results[rate_name] = greeks
+        for option_type, market_iv in (('CE', ce_iv), ('PE', pe_iv))
+        for rate_value in rates_to_compare.values()
+    ])
+    ce_greeks = greeks_matrix[:len(rates_to_compare)]
+    pe_greeks = greeks_matrix[len(rates_to_compare):]
 
-        print(f"{rate_name:<20} {greeks['delta']:>10.4f} {greeks['gamma']:>10.6f} "
-              f"{greeks['vega']:>10.4f} {greeks['theta']:>10.4f}")
-
-    print()
-    print("=" * 80)
-    print("PUT OPTION (PE) GREEKS COMPARISON")
-    print("=" * 80)
-    print()
+    out("=" * 80)
+    out("CALL OPTION (CE) GREEKS COMPARISON")
+    out("=" * 80)
+    out("")
 
     # Header
-    print(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
-    print("-" * 80)
+    out(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
+    out("-" * 80)
 
-    pe_results = {}
-    for rate_name, rate_value in rates_to_compare.items():
-        greeks = calculate_greeks_with_rate(
-            spot=spot,
-            strike=strike,
-            time_to_expiry=time_to_expiry,
-            market_iv=pe_iv,
-            option_type='PE',
-            risk_free_rate=rate_value
-        )
-        pe_results[rate_name] = greeks
+    for rate_name, greeks in zip(rates_to_compare, ce_greeks):
+        out("%-20s %10.4f %10.6f %10.4f %10.4f" % (rate_name, *greeks))
 
-        print(f"{rate_name:<20} {greeks['delta']:>10.4f} {greeks['gamma']:>10.6f} "
-              f"{greeks['vega']:>10.4f} {greeks['theta']:>10.4f}")
+    out("")
+    out("=" * 80)
+    out("PUT OPTION (PE) GREEKS COMPARISON")
+    out("=" * 80)
+    out("")
 
-    print()
-    print("=" * 80)
-    print("PERCENTAGE DIFFERENCES (Relative to NSE 10% Standard)")
-    print("=" * 80)
-    print()
-
-    # Calculate percentage differences relative to NSE (10%)
-    nse_ce = ce_results['NSE (10%)']
-    nse_pe = pe_results['NSE (10%)']
-
-    print("CALL OPTION (CE) - % Difference from NSE:")
-    print(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
-    print("-" * 80)
-
-    for rate_name, greeks in ce_results.items():
-        if rate_name == 'NSE (10%)':
-            print(f"{rate_name:<20} {'0.00%':>10} {'0.00%':>10} {'0.00%':>10} {'0.00%':>10}")
-        else:
-            delta_diff = ((greeks['delta'] - nse_ce['delta']) / nse_ce['delta'] * 100) if nse_ce['delta'] != 0 else 0
-            gamma_diff = ((greeks['gamma'] - nse_ce['gamma']) / nse_ce['gamma'] * 100) if nse_ce['gamma'] != 0 else 0
-            vega_diff = ((greeks['vega'] - nse_ce['vega']) / nse_ce['vega'] * 100) if nse_ce['vega'] != 0 else 0
-            theta_diff = ((greeks['theta'] - nse_ce['theta']) / nse_ce['theta'] * 100) if nse_ce['theta'] != 0 else 0
-
-            print(f"{rate_name:<20} {delta_diff:>9.2f}% {gamma_diff:>9.2f}% "
-                  f"{vega_diff:>9.2f}% {theta_diff:>9.2f}%")
-
-    print()
-    print("PUT OPTION (PE) - % Difference from NSE:")
-    print(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
-    print("-" * 80)
-
-    for rate_name, greeks in pe_results.items():
-        if rate_name == 'NSE (10%)':
-            print(f"{rate_name:<20} {'0.00%':>10} {'0.00%':>10} {'0.00%':>10} {'0.00%':>10}")
-        else:
-            delta_diff = ((greeks['delta'] - nse_pe['delta']) / abs(nse_pe['delta']) * 100) if nse_pe['delta'] != 0 else 0
-            gamma_diff = ((greeks['gamma'] - nse_pe['gamma']) / nse_pe['gamma'] * 100) if nse_pe['gamma'] != 0 else 0
-            vega_diff = ((greeks['vega'] - nse_pe['vega']) / nse_pe['vega'] * 100) if nse_pe['vega'] != 0 else 0
-            theta_diff = ((greeks['theta'] - nse_pe['theta']) / abs(nse_pe['theta']) * 100) if nse_pe['theta'] != 0 else 0
-
-            print(f"{rate_name:<20} {delta_diff:>9.2f}% {gamma_diff:>9.2f}% "
-                  f"{vega_diff:>9.2f}% {theta_diff:>9.2f}%")
-
-    print()
-    print("=" * 80)
-    print("INTERPRETATION & RECOMMENDATIONS")
-    print("=" * 80)
-    print()
-    print("If your broker's Greeks match:")
-    print()
-    print("  NSE (10%)          → Use RISK_FREE_RATE = 0.10 in kite_config.py")
-    print("                       (Recommended for: Kite, Dhan, NSE website)")
-    print()
-    print("  Custom (6.5%)      → Use RISK_FREE_RATE = 0.065 in kite_config.py")
-    print("                       (Previous default in this codebase)")
-    print()
-    print("  RBI T-Bill (5.43%) → Use RISK_FREE_RATE = 0.0543 in kite_config.py")
-    print("                       (Theoretically correct, current market rate)")
-    print()
-    print("  If none match exactly:")
-    print("    - Sensibull may use futures price instead of spot")
-    print("    - Some platforms may use different time calculations")
-    print("    - Intraday vs end-of-day time adjustments")
-    print("    - Different day count conventions (252 vs 365)")
-    print()
-    print("=" * 80)
-    print()
-
-    # Save to file if requested
-    if output_path:
-        print(f"Report saved to: {output_path}")
-
-    print("To change the risk-free rate, edit kite_config.py:")
-    print("  RISK_FREE_RATE = RISK_FREE_RATE_NSE  # For NSE compatibility")
-    print()
+    # Header
+    out(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
+    out("-" * 80)
+
+    for rate_name, greeks in zip(rates_to_compare, pe_greeks):
+        out("%-20s %10.4f %10.6f %10.4f %10.4f" % (rate_name, *greeks))
+
+    out("")
+    out("=" * 80)
+    out("PERCENTAGE DIFFERENCES (Relative to NSE 10% Standard)")
+    out("=" * 80)
+    out("")
+
+    # Calculate percentage differences relative to NSE (10%), the first rate
+    ce_diff = _percent_diff_from_first(ce_greeks)
+    pe_diff = _percent_diff_from_first(pe_greeks)
+
+    out("CALL OPTION (CE) - % Difference from NSE:")
+    out(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
+    out("-" * 80)
+
+    out(_format_percent_rows(rates_to_compare, ce_diff))
+
+    out("")
+    out("PUT OPTION (PE) - % Difference from NSE:")
+    out(f"{'Risk-Free Rate':<20} {'Delta':>10} {'Gamma':>10} {'Vega':>10} {'Theta':>10}")
+    out("-" * 80)
+
+    out(_format_percent_rows(rates_to_compare, pe_diff))
+
+    out("")
+    out("=" * 80)
+    out("INTERPRETATION & RECOMMENDATIONS")
+    out("=" * 80)
+    out("")
+    out("If your broker's Greeks match:")
+    out("")
+    out("  NSE (10%)          → Use RISK_FREE_RATE = 0.10 in kite_config.py")
+    out("                       (Recommended for: Kite, Dhan, NSE website)")
+    out("")
+    out("  Custom (6.5%)      → Use RISK_FREE_RATE = 0.065 in kite_config.py")
+    out("                       (Previous default in this codebase)")
+    out("")
+    out("  RBI T-Bill (5.43%) → Use RISK_FREE_RATE = 0.0543 in kite_config.py")
+    out("                       (Theoretically correct, current market rate)")
+    out("")
+    out("  If none match exactly:")
+    out("    - Sensibull may use futures price instead of spot")
+    out("    - Some platforms may use different time calculations")
+    out("    - Intraday vs end-of-day time adjustments")
+    out("    - Different day count conventions (252 vs 365)")
+    out("")
+    out("=" * 80)
+    out("")
+
+    out("To change the risk-free rate, edit kite_config.py:")
+    out("  RISK_FREE_RATE = RISK_FREE_RATE_NSE  # For NSE compatibility")
+    out("")
+
+    return True
 
 
 def main():
+    # CLI-only imports, kept out of module import for library callers
+    import argparse
+    from pathlib import Path
+
     parser = argparse.ArgumentParser(
         description='Generate Greeks validation report comparing different risk-free rates'
     )